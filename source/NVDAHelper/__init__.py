@@ -8,10 +8,12 @@
 	HANDLE,
 	HKEY,
 )
+import functools
 import typing
 import os
 import winreg
 import msvcrt
+from queue import SimpleQueue
 
 from ctypes import (
 	CDLL,
@@ -23,9 +25,9 @@
 	c_int,
 	c_long,
 	c_ulong,
+	c_ushort,
 	c_void_p,
 	c_wchar_p,
-	c_wchar,
 	cast,
 	create_unicode_buffer,
 	windll,
@@ -49,6 +51,8 @@
 import eventHandler
 import queueHandler
 import api
+import speech
+import braille
 from logHandler import log
 from utils.security import isLockScreenModeActive
 from winAPI.constants import SystemErrorCodes
@@ -74,14 +78,20 @@ def _setDllFuncPointer(dll, name, cfunc):
 	cast(getattr(dll, name), POINTER(c_void_p)).contents.value = cast(cfunc, c_void_p).value  # noqa: F405
 
 
+def _isFocusInFullSleepMode() -> bool:
+	"""Whether NVDA should fully sleep for the current focus object,
+	in which case nvdaController calls should be ignored.
+	sleepMode is deliberately not cached on NVDAObjects, so it is evaluated on every call.
+	"""
+	focus = api.getFocusObject()
+	return focus.sleepMode == focus.SLEEP_FULL
+
+
 # Implementation of nvdaController methods
 @WINFUNCTYPE(c_long, c_wchar_p)
 def nvdaController_speakText(text):
-	focus = api.getFocusObject()
-	if focus.sleepMode == focus.SLEEP_FULL:
+	if _isFocusInFullSleepMode():
 		return -1
-	import speech
-
 	queueHandler.queueFunction(queueHandler.eventQueue, speech.speakText, text)
 	return SystemErrorCodes.SUCCESS
 
@@ -96,11 +106,9 @@ def nvdaController_speakSsml(  # noqa: C901
 	priority: "SpeechPriority",
 	asynchronous: bool,
 ) -> SystemErrorCodes:
-	focus = api.getFocusObject()
-	if focus.sleepMode == focus.SLEEP_FULL:
+	if _isFocusInFullSleepMode():
 		return SystemErrorCodes.ACCESS_DENIED
 
-	import speech
 	from characterProcessing import SymbolLevel
 	from speech.priorities import SpeechPriority
 	from speech.speech import _getSpeakSsmlSpeech
@@ -120,8 +128,6 @@ def nvdaController_speakSsml(  # noqa: C901
 	prefixSpeechCommand = None
 	markCallable = None
 	if not asynchronous:
-		from queue import SimpleQueue
-
 		markQueue = SimpleQueue()
 
 		import synthDriverHandler
@@ -175,28 +181,27 @@ def markCallable(name: str):
 
 @WINFUNCTYPE(c_long)
 def nvdaController_cancelSpeech():
-	focus = api.getFocusObject()
-	if focus.sleepMode == focus.SLEEP_FULL:
+	if _isFocusInFullSleepMode():
 		return -1
-	import speech
-
 	queueHandler.queueFunction(queueHandler.eventQueue, speech.cancelSpeech)
 	return SystemErrorCodes.SUCCESS
 
 
 @WINFUNCTYPE(c_long, c_wchar_p)
 def nvdaController_brailleMessage(text: str) -> SystemErrorCodes:
-	focus = api.getFocusObject()
-	if focus.sleepMode == focus.SLEEP_FULL:
+	if _isFocusInFullSleepMode():
 		return -1
 	if config.conf["braille"]["reportLiveRegions"]:
-		import braille
-
 		queueHandler.queueFunction(queueHandler.eventQueue, braille.handler.message, text)
 	return SystemErrorCodes.SUCCESS
 
 
+@functools.lru_cache(maxsize=128)
 def _lookupKeyboardLayoutNameWithHexString(layoutString):
+	"""Looks up the display name of a keyboard layout in the registry.
+	Results, including failed lookups, are cached for the lifetime of NVDAHelper,
+	as the installed layouts rarely change during a session.
+	"""
 	buf = create_unicode_buffer(1024)
 	bufSize = c_ulong(2048)
 	key = HKEY()  # noqa: F405
@@ -230,6 +235,18 @@ def _lookupKeyboardLayoutNameWithHexString(layoutString):
 			winBindings.advapi32.RegCloseKey(key)
 
 
+@functools.lru_cache(maxsize=128)
+def _lookupLanguageName(languageID: int) -> str | None:
+	"""Looks up the localized name of a language, or C{None} if it is unknown.
+	Results are cached, so repeated input language changes don't need a new buffer and locale lookup.
+	"""
+	buf = create_unicode_buffer(1024)
+	# 2 is LOCALE_SLANGUAGE
+	if winBindings.kernel32.GetLocaleInfo(languageID, 2, buf, 1024):
+		return buf.value
+	return None
+
+
 @WINFUNCTYPE(c_long, c_wchar_p)
 def nvdaControllerInternal_requestRegistration(uuidString):
 	pid = c_long()
@@ -270,11 +287,8 @@ def nvdaControllerInternal_reportLiveRegion(text: str, politeness: str):
 	assert isinstance(politeness, str), "Politeness isn't a string"
 	if not config.conf["presentation"]["reportDynamicContentChanges"]:
 		return -1
-	focus = api.getFocusObject()
-	if focus.sleepMode == focus.SLEEP_FULL:
+	if _isFocusInFullSleepMode():
 		return -1
-	import speech
-	import braille
 	from aria import AriaLivePoliteness
 	from speech.priorities import Spri
 
@@ -288,16 +302,16 @@ def nvdaControllerInternal_reportLiveRegion(text: str, politeness: str):
 		return -1
 	if politenessValue == AriaLivePoliteness.OFF:
 		log.error(f"nvdaControllerInternal_reportLiveRegion got unexpected politeness of {politeness}")
-	queueHandler.queueFunction(
-		queueHandler.eventQueue,
-		speech.speakText,
-		text,
-		priority=(Spri.NEXT if politenessValue == AriaLivePoliteness.ASSERTIVE else Spri.NORMAL),
-	)
-	queueHandler.queueFunction(
+	queueHandler._queueFunctions(
 		queueHandler.eventQueue,
-		braille.handler.message,
-		text,
+		(
+			(
+				speech.speakText,
+				(text,),
+				{"priority": Spri.NEXT if politenessValue == AriaLivePoliteness.ASSERTIVE else Spri.NORMAL},
+			),
+			(braille.handler.message, (text,), {}),
+		),
 	)
 	return 0
 
@@ -335,14 +349,17 @@ def nvdaControllerInternal_logMessage(level, pid, message):
 	return 0
 
 
+_COMPOSITION_LEADING_SPACES = "\u3000 "
+"""Ideographic and ASCII spaces stripped from the start of a finished input composition."""
+
+
 def handleInputCompositionEnd(result):
-	import speech
 	import characterProcessing
 	from NVDAObjects.inputComposition import InputComposition
 	from NVDAObjects.IAccessible.mscandui import ModernCandidateUICandidateItem
 
 	focus = api.getFocusObject()
-	result = result.lstrip("\u3000 ")
+	result = result.lstrip(_COMPOSITION_LEADING_SPACES)
 	curInputComposition = None
 	if isinstance(focus, InputComposition):
 		curInputComposition = focus
@@ -371,13 +388,12 @@ def handleInputCompositionEnd(result):
 		speech.setSpeechMode(oldSpeechMode)
 
 	if curInputComposition and not result:
-		result = curInputComposition.compositionString.lstrip("\u3000 ")
+		result = curInputComposition.compositionString.lstrip(_COMPOSITION_LEADING_SPACES)
 	if result:
 		speech.speakText(result, symbolLevel=characterProcessing.SymbolLevel.ALL)
 
 
 def handleInputCompositionStart(compositionString, selectionStart, selectionEnd, isReading):
-	import speech
 	from NVDAObjects.inputComposition import InputComposition
 	from NVDAObjects.behaviors import CandidateItem
 
@@ -436,12 +452,11 @@ def nvdaControllerInternal_inputCompositionUpdate(compositionString, selectionSt
 
 
 def handleInputCandidateListUpdate(candidatesString, selectionIndex, inputMethod):
-	candidateStrings = candidatesString.split("\n")
-	import speech
 	from NVDAObjects.inputComposition import CandidateItem
 
 	focus = api.getFocusObject()
-	if not (0 <= selectionIndex < len(candidateStrings)):
+	# Only split the candidates once we know the selection is valid.
+	if not (0 <= selectionIndex <= candidatesString.count("\n")):
 		if isinstance(focus, CandidateItem):
 			oldSpeechMode = speech.getState().speechMode
 			speech.setSpeechMode(speech.SpeechMode.off)
@@ -458,7 +473,7 @@ def handleInputCandidateListUpdate(candidatesString, selectionIndex, inputMethod
 		wasCandidate = False
 	item = CandidateItem(
 		parent=parent,
-		candidateStrings=candidateStrings,
+		candidateStrings=candidatesString.split("\n"),
 		candidateIndex=selectionIndex,
 		inputMethod=inputMethod,
 	)
@@ -539,15 +554,10 @@ def handleInputConversionModeUpdate(oldFlags, newFlags, lcid):
 		if msg:
 			textList.append(msg)
 	else:
-		for x in range(32):
-			x = 2**x
-			msgs = inputConversionModeMessages.get(x)
-			if not msgs:
-				continue
-			newOn = bool(newFlags & x)
-			oldOn = bool(oldFlags & x)
-			if newOn != oldOn:
-				textList.append(msgs[0] if newOn else msgs[1])
+		changedFlags = oldFlags ^ newFlags
+		for flag, msgs in inputConversionModeMessages.items():
+			if changedFlags & flag:
+				textList.append(msgs[0] if newFlags & flag else msgs[1])
 	if len(textList) > 0:
 		queueHandler.queueFunction(queueHandler.eventQueue, ui.message, " ".join(textList))
 
@@ -605,11 +615,11 @@ def nvdaControllerInternal_inputLangChangeNotify(threadID, hkl, layoutString):
 		return 0
 	import ui
 
-	buf = create_unicode_buffer(1024)
-	res = winBindings.kernel32.GetLocaleInfo(languageID, 2, buf, 1024)
-	# Translators: the label for an unknown language when switching input methods.
-	inputLanguageName = buf.value if res else _("unknown language")
-	layoutStringCodes = []
+	inputLanguageName = _lookupLanguageName(languageID)
+	if not inputLanguageName:
+		# Translators: the label for an unknown language when switching input methods.
+		inputLanguageName = _("unknown language")
+	layoutCodes = []
 	inputMethodName = None
 	# layoutString can either be a real input method name, a hex string for an input method name in the registry, or an empty string.
 	# If it is a real input method name, then it is used as is.
@@ -617,17 +627,18 @@ def nvdaControllerInternal_inputLangChangeNotify(threadID, hkl, layoutString):
 	# The full hex string, the hkl as a hex string, the low word of the hex string or hkl, the high word of the hex string or hkl.
 	if layoutString:
 		try:
-			int(layoutString, 16)
-			layoutStringCodes.append(layoutString)
+			layoutCodes.append(int(layoutString, 16) & 0xFFFFFFFF)
 		except ValueError:
 			inputMethodName = layoutString
 	if not inputMethodName:
-		layoutStringCodes.insert(0, hex(hkl)[2:].rstrip("L").upper().rjust(8, "0"))
-		for stringCode in list(layoutStringCodes):
-			layoutStringCodes.append(stringCode[4:].rjust(8, "0"))
-			if stringCode[0] < "D":
-				layoutStringCodes.append(stringCode[0:4].rjust(8, "0"))
-		for stringCode in layoutStringCodes:
+		layoutCodes.insert(0, hkl & 0xFFFFFFFF)
+		layoutStringCodes = [f"{code:08X}" for code in layoutCodes]
+		for code in layoutCodes:
+			layoutStringCodes.append(f"{code & 0xFFFF:08X}")
+			# The high word is only a candidate when the hex string doesn't start with D, E or F.
+			if code >> 28 < 0xD:
+				layoutStringCodes.append(f"{code >> 16:08X}")
+		for stringCode in dict.fromkeys(layoutStringCodes):
 			inputMethodName = _lookupKeyboardLayoutNameWithHexString(stringCode)
 			if inputMethodName:
 				break
@@ -636,8 +647,9 @@ def nvdaControllerInternal_inputLangChangeNotify(threadID, hkl, layoutString):
 		# Translators: The label for an unknown input method when switching input methods.
 		inputMethodName = _("unknown input method")
 	# Remove the language name if it is in the input method name.
-	if " - " in inputMethodName:
-		inputMethodName = "".join(inputMethodName.split(" - ")[1:])
+	_languageName, separator, layoutName = inputMethodName.partition(" - ")
+	if separator:
+		inputMethodName = layoutName
 	# Include the language only if it changed.
 	if languageID != lastLanguageID:
 		msg = "{language} - {layout}".format(language=inputLanguageName, layout=inputMethodName)
@@ -649,11 +661,13 @@ def nvdaControllerInternal_inputLangChangeNotify(threadID, hkl, layoutString):
 	return 0
 
 
-@WINFUNCTYPE(c_long, c_wchar)
-def nvdaControllerInternal_typedCharacterNotify(ch):
+# The character is received as a raw UTF-16 code unit,
+# so that no str is created for console windows, which ignore typed characters.
+@WINFUNCTYPE(c_long, c_ushort)
+def nvdaControllerInternal_typedCharacterNotify(ch: int):
 	focus = api.getFocusObject()
 	if focus.windowClassName != "ConsoleWindowClass":
-		eventHandler.queueEvent("typedCharacter", focus, ch=ch)
+		eventHandler.queueEvent("typedCharacter", focus, ch=chr(ch))
 	return 0
 
 
@@ -726,13 +740,14 @@ def nvdaControllerInternal_handleRemoteURL(url):
 class _RemoteLoader:
 	def __init__(self, loaderDir: str):
 		# Create a pipe so we can write to stdin of the loader process.
-		pipeReadOrig, self._pipeWrite = winKernel.CreatePipe(None, 0)
+		pipeRead, self._pipeWrite = winKernel.CreatePipe(None, 0)
 		# Make the read end of the pipe inheritable.
-		pipeRead = self._duplicateAsInheritable(pipeReadOrig)
-		winKernel.closeHandle(pipeReadOrig)
+		# We own this handle, so just set its inherit flag rather than duplicating it.
+		winKernel.SetHandleInformation(pipeRead, winKernel.HANDLE_FLAG_INHERIT, winKernel.HANDLE_FLAG_INHERIT)
 		# stdout/stderr of the loader process should go to nul.
 		# Though we aren't using pythonic functions to write to nul,
 		# open it in binary mode as opening it in text mode (the default) doesn't make sense.
+		# The nul handle is owned by the file object and closed with it, so it must be duplicated.
 		with open("nul", "wb") as nul:
 			nulHandle = self._duplicateAsInheritable(msvcrt.get_osfhandle(nul.fileno()))
 		# Set the process to start with the appropriate std* handles.
@@ -764,14 +779,55 @@ def _duplicateAsInheritable(self, handle):
 		curProc = winKernel.GetCurrentProcess()
 		return winKernel.DuplicateHandle(curProc, handle, curProc, 0, True, winKernel.DUPLICATE_SAME_ACCESS)
 
+	_TERMINATE_TIMEOUT_MS = 5000
+	"""How long to wait for the loader process to exit gracefully before terminating it."""
+
 	def terminate(self):
 		# Closing the write end of the pipe will cause EOF for the waiting loader process, which will then exit gracefully.
 		winKernel.closeHandle(self._pipeWrite)
-		# Wait until it's dead.
-		winKernel.waitForSingleObject(self._process, winKernel.INFINITE)
+		# Wait until it's dead, but don't hang NVDA's exit if the loader is stuck.
+		if winKernel.waitForSingleObject(self._process, self._TERMINATE_TIMEOUT_MS) == winKernel.WAIT_TIMEOUT:
+			log.error("Remote loader did not exit after closing its input pipe, terminating it")
+			try:
+				winKernel.TerminateProcess(self._process, 1)
+			except OSError:
+				log.error("Error terminating remote loader", exc_info=True)
 		winKernel.closeHandle(self._process)
 
 
+_dllCallbacks: tuple[tuple[str, typing.Callable], ...] = (
+	("nvdaController_speakText", nvdaController_speakText),
+	("nvdaController_speakSsml", nvdaController_speakSsml),
+	("nvdaController_cancelSpeech", nvdaController_cancelSpeech),
+	("nvdaController_brailleMessage", nvdaController_brailleMessage),
+	("nvdaControllerInternal_requestRegistration", nvdaControllerInternal_requestRegistration),
+	("nvdaControllerInternal_reportLiveRegion", nvdaControllerInternal_reportLiveRegion),
+	("nvdaControllerInternal_inputLangChangeNotify", nvdaControllerInternal_inputLangChangeNotify),
+	("nvdaControllerInternal_typedCharacterNotify", nvdaControllerInternal_typedCharacterNotify),
+	(
+		"nvdaControllerInternal_displayModelTextChangeNotify",
+		nvdaControllerInternal_displayModelTextChangeNotify,
+	),
+	("nvdaControllerInternal_logMessage", nvdaControllerInternal_logMessage),
+	("nvdaControllerInternal_inputCompositionUpdate", nvdaControllerInternal_inputCompositionUpdate),
+	("nvdaControllerInternal_inputCandidateListUpdate", nvdaControllerInternal_inputCandidateListUpdate),
+	("nvdaControllerInternal_IMEOpenStatusUpdate", nvdaControllerInternal_IMEOpenStatusUpdate),
+	(
+		"nvdaControllerInternal_inputConversionModeUpdate",
+		nvdaControllerInternal_inputConversionModeUpdate,
+	),
+	("nvdaControllerInternal_vbufChangeNotify", nvdaControllerInternal_vbufChangeNotify),
+	(
+		"nvdaControllerInternal_installAddonPackageFromPath",
+		nvdaControllerInternal_installAddonPackageFromPath,
+	),
+	("nvdaControllerInternal_drawFocusRectNotify", nvdaControllerInternal_drawFocusRectNotify),
+	("nvdaControllerInternal_openConfigDirectory", nvdaControllerInternal_openConfigDirectory),
+	("nvdaControllerInternal_handleRemoteURL", nvdaControllerInternal_handleRemoteURL),
+)
+"""The nvdaHelperLocal function pointers and the ctypes wrapped python functions they are set to in L{initialize}."""
+
+
 def initialize() -> None:
 	global _remoteLib, _remoteLoaderX86, _remoteLoaderAMD64, _remoteLoaderARM64
 	global lastLanguageID, lastLayoutString
@@ -782,36 +838,7 @@ def initialize() -> None:
 	res = user32.GetKeyboardLayoutName(buf)
 	if res:
 		lastLayoutString = buf.value
-	for name, func in [
-		("nvdaController_speakText", nvdaController_speakText),
-		("nvdaController_speakSsml", nvdaController_speakSsml),
-		("nvdaController_cancelSpeech", nvdaController_cancelSpeech),
-		("nvdaController_brailleMessage", nvdaController_brailleMessage),
-		("nvdaControllerInternal_requestRegistration", nvdaControllerInternal_requestRegistration),
-		("nvdaControllerInternal_reportLiveRegion", nvdaControllerInternal_reportLiveRegion),
-		("nvdaControllerInternal_inputLangChangeNotify", nvdaControllerInternal_inputLangChangeNotify),
-		("nvdaControllerInternal_typedCharacterNotify", nvdaControllerInternal_typedCharacterNotify),
-		(
-			"nvdaControllerInternal_displayModelTextChangeNotify",
-			nvdaControllerInternal_displayModelTextChangeNotify,
-		),
-		("nvdaControllerInternal_logMessage", nvdaControllerInternal_logMessage),
-		("nvdaControllerInternal_inputCompositionUpdate", nvdaControllerInternal_inputCompositionUpdate),
-		("nvdaControllerInternal_inputCandidateListUpdate", nvdaControllerInternal_inputCandidateListUpdate),
-		("nvdaControllerInternal_IMEOpenStatusUpdate", nvdaControllerInternal_IMEOpenStatusUpdate),
-		(
-			"nvdaControllerInternal_inputConversionModeUpdate",
-			nvdaControllerInternal_inputConversionModeUpdate,
-		),
-		("nvdaControllerInternal_vbufChangeNotify", nvdaControllerInternal_vbufChangeNotify),
-		(
-			"nvdaControllerInternal_installAddonPackageFromPath",
-			nvdaControllerInternal_installAddonPackageFromPath,
-		),
-		("nvdaControllerInternal_drawFocusRectNotify", nvdaControllerInternal_drawFocusRectNotify),
-		("nvdaControllerInternal_openConfigDirectory", nvdaControllerInternal_openConfigDirectory),
-		("nvdaControllerInternal_handleRemoteURL", nvdaControllerInternal_handleRemoteURL),
-	]:
+	for name, func in _dllCallbacks:
 		try:
 			_setDllFuncPointer(localLib.dll, f"_{name}", func)
 		except AttributeError as e:
@@ -830,10 +857,11 @@ def initialize() -> None:
 	h = winBindings.kernel32.LoadLibraryEx(
 		ReadPaths.nvdaHelperRemoteDll,
 		0,
-		# Using an altered search path is necessary here
-		# As NVDAHelperRemote needs to locate dependent dlls in the same directory
+		# NVDAHelperRemote needs to locate dependent dlls in the same directory
 		# such as IAccessible2proxy.dll.
-		winKernel.LOAD_WITH_ALTERED_SEARCH_PATH,
+		# Searching the dll's own directory and the default directories only
+		# avoids probing the current directory and every directory on PATH.
+		winKernel.LOAD_LIBRARY_SEARCH_DLL_LOAD_DIR | winKernel.LOAD_LIBRARY_SEARCH_DEFAULT_DIRS,
 	)
 	if not h:
 		log.critical("Error loading nvdaHelperRemote.dll: %s" % WinError())  # noqa: F405
@@ -877,6 +905,8 @@ def terminate():
 		if _remoteLoaderARM64:
 			_remoteLoaderARM64.terminate()
 			_remoteLoaderARM64 = None
+	_lookupKeyboardLayoutNameWithHexString.cache_clear()
+	_lookupLanguageName.cache_clear()
 	localLib.nvdaHelperLocal_terminate()
 
 
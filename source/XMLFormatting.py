@@ -8,13 +8,15 @@
 import textInfos
 import textUtils
 from logHandler import log
-from textUtils import WCHAR_ENCODING, isLowSurrogate
+from textUtils import isHighSurrogate, isLowSurrogate
 
 CommandsT = typing.Union[textInfos.FieldCommand, typing.Optional[str]]
 CommandListT = typing.List[CommandsT]
 
 
 class XMLTextParser(object):
+	__slots__ = ("_controlFieldStack", "_commandList")
+
 	def __init__(self) -> None:
 		self._controlFieldStack: list[textInfos.ControlField] = []
 
@@ -39,22 +41,18 @@ def _startElementHandler(self, tagName, attrs):
 			raise ValueError("Unknown tag name: %s" % tagName)
 
 		# Normalise attributes common to both field types.
-		try:
-			newAttrs["_startOfNode"] = newAttrs["_startOfNode"] == "1"
-		except KeyError:
-			pass
-		try:
-			newAttrs["_endOfNode"] = newAttrs["_endOfNode"] == "1"
-		except KeyError:
-			pass
-		try:
-			newAttrs["_offsetFromStartOfNode"] = int(newAttrs["_offsetFromStartOfNode"])
-		except KeyError:
-			pass
-		try:
-			newAttrs["_offsetFromEndOfNode"] = int(newAttrs["_offsetFromEndOfNode"])
-		except KeyError:
-			pass
+		value = attrs.get("_startOfNode")
+		if value is not None:
+			newAttrs["_startOfNode"] = value == "1"
+		value = attrs.get("_endOfNode")
+		if value is not None:
+			newAttrs["_endOfNode"] = value == "1"
+		value = attrs.get("_offsetFromStartOfNode")
+		if value is not None:
+			newAttrs["_offsetFromStartOfNode"] = int(value)
+		value = attrs.get("_offsetFromEndOfNode")
+		if value is not None:
+			newAttrs["_offsetFromEndOfNode"] = int(value)
 
 	def _EndElementHandler(self, tagName):
 		if tagName == "control":
@@ -71,16 +69,22 @@ def _CharacterDataHandler(self, data: typing.Optional[str], processBufferedSurro
 			dataStr = repr(data)
 			log.warning(f"unknown type for data: {dataStr}")
 		if cmdList and isinstance(cmdList[-1], str):
-			cmdList[-1] += data
-			if processBufferedSurrogates:
-				cmdList[-1] = (
-					cmdList[-1].encode(WCHAR_ENCODING, errors="surrogatepass").decode(WCHAR_ENCODING)
+			lastStr = cmdList[-1]
+			if processBufferedSurrogates and lastStr and isHighSurrogate(lastStr[-1]):
+				# Combine the buffered high surrogate and this low surrogate into one character,
+				# rather than re-encoding the whole buffered string.
+				cmdList[-1] = lastStr[:-1] + chr(
+					0x10000 + ((ord(lastStr[-1]) - 0xD800) << 10) + (ord(data) - 0xDC00),
 				)
+			else:
+				cmdList[-1] = lastStr + data
 		else:
 			cmdList.append(data)
 
 	def parse(self, XMLText) -> CommandListT:
 		parser = expat.ParserCreate("utf-8")
+		# Coalesce adjacent character data (e.g. around entity references) into one handler call.
+		parser.buffer_text = True
 		parser.StartElementHandler = self._startElementHandler
 		parser.EndElementHandler = self._EndElementHandler
 		parser.CharacterDataHandler = self._CharacterDataHandler
@@ -13,7 +13,7 @@
 """
 
 from dataclasses import dataclass, field
-from functools import partial
+from functools import lru_cache, partial
 import itertools
 import threading
 from concurrent.futures import ThreadPoolExecutor, Future
@@ -22,7 +22,6 @@
 	Any,
 	NamedTuple,
 )
-from collections import OrderedDict
 from collections.abc import Callable, Generator, Iterable, Iterator
 import hwPortUtils
 import NVDAState
@@ -34,6 +33,7 @@
 import re
 from winAPI import messageWindow
 import extensionPoints
+import wx
 from logHandler import log
 from collections import defaultdict
 
@@ -159,8 +159,78 @@ def matches(self, deviceMatch: DeviceMatch) -> bool:
 
 
 DriverDictT = defaultdict[CommunicationType, set[_UsbDeviceRegistryEntry] | MatchFuncT]
-_driverDevices = OrderedDict[str, DriverDictT]()
+_driverDevices: dict[str, DriverDictT] = {}
+"""
+The devices registered for every driver, in detection order.
+This should only be modified through L{DriverRegistrar}, which keeps the indexes derived from it up to date.
+Code that modifies it directly, such as to reorder or remove drivers, must call L{_driverDevicesChanged}.
+"""
 type DriverAndDeviceMatch = tuple[str, DeviceMatch]
+type _UsbIndexT = dict[tuple[ProtocolType, str], list[tuple[str, _UsbDeviceRegistryEntry]]]
+
+_usbIndex: _UsbIndexT | None = None
+"""
+Maps protocol types and USB IDs to the drivers and registry entries registered for them,
+in the order of L{_driverDevices}.
+This is built on demand by L{_getUsbIndex} and reset by L{_driverDevicesChanged}.
+"""
+
+
+def _getUsbIndex() -> _UsbIndexT:
+	"""Get the index of USB registrations, building it from L{_driverDevices} if necessary.
+	This allows looking up the drivers for a device match directly,
+	rather than testing every registration of every driver.
+	"""
+	global _usbIndex
+	if _usbIndex is None:
+		index: _UsbIndexT = {}
+		for driver, devs in _driverDevices.items():
+			for definition in devs[CommunicationType.USB]:
+				index.setdefault((definition.type, definition.id), []).append((driver, definition))
+		_usbIndex = index
+	return _usbIndex
+
+
+_bluetoothMatchFuncs: list[tuple[str, MatchFuncT]] | None = None
+"""
+The drivers that registered a Bluetooth match function, with that function, in the order of L{_driverDevices}.
+This is built on demand by L{_getBluetoothMatchFuncs} and reset by L{_driverDevicesChanged}.
+"""
+
+
+def _getBluetoothMatchFuncs() -> list[tuple[str, MatchFuncT]]:
+	"""Get the Bluetooth match functions of all drivers, collecting them from L{_driverDevices} if necessary.
+	Drivers without a Bluetooth match function are left out,
+	so they don't have to be skipped for every device match.
+	"""
+	global _bluetoothMatchFuncs
+	if _bluetoothMatchFuncs is None:
+		matchFuncs: list[tuple[str, MatchFuncT]] = []
+		for driver, devs in _driverDevices.items():
+			matchFunc = devs.get(CommunicationType.BLUETOOTH)
+			if not matchFunc:
+				# The driver has no Bluetooth match function.
+				# Looking one up through the defaultdict leaves an empty set behind.
+				continue
+			if not callable(matchFunc):
+				log.debugWarning(
+					f"Skipping non-callable Bluetooth matchFunc {matchFunc!r} for driver {driver!r}",
+				)
+				continue
+			matchFuncs.append((driver, matchFunc))
+		_bluetoothMatchFuncs = matchFuncs
+	return _bluetoothMatchFuncs
+
+
+def _driverDevicesChanged():
+	"""Reset the indexes derived from L{_driverDevices}.
+	This should be called whenever L{_driverDevices} is modified other than through L{DriverRegistrar},
+	e.g. when drivers are removed or the order of drivers changes.
+	"""
+	global _usbIndex, _bluetoothMatchFuncs
+	_usbIndex = None
+	_bluetoothMatchFuncs = None
+
 
 scanForDevices = extensionPoints.Chain[DriverAndDeviceMatch]()
 """
@@ -193,41 +263,49 @@ def getDriversForConnectedUsbDevices(
 	"""
 	if limitToDevices and _isDebug():
 		log.debug("Limiting connected USB device detection to drivers: %r", limitToDevices)
+	# This is checked for every match, so use a set for constant time lookups.
+	limitToDevices = frozenset(limitToDevices) if limitToDevices else None
+	usbIndex = _getUsbIndex()
+	# Custom and serial matches are only used to look for a custom driver,
+	# so they are only created for devices some driver registered.
 	usbCustomDeviceMatches = (
 		DeviceMatch(ProtocolType.CUSTOM, port["usbID"], port["devicePath"], port)
 		for port in deviceInfoFetcher.usbDevices
+		if (ProtocolType.CUSTOM, port["usbID"]) in usbIndex
 	)
 	usbComDeviceMatches = (
 		DeviceMatch(ProtocolType.SERIAL, port["usbID"], port["port"], port)
 		for port in deviceInfoFetcher.usbComPorts
+		if (ProtocolType.SERIAL, port["usbID"]) in usbIndex
 	)
-	# Tee is used to ensure that the DeviceMatches aren't created multiple times.
-	# The processing of these HID device matches, looking for a custom driver, means that all
-	# HID device matches are created, and by teeing the output the matches don't need to be created again.
-	# The corollary is that clients of this method don't have to process all devices (and create all
-	# device matches), if one is found early the iteration can stop.
-	usbHidDeviceMatches, usbHidDeviceMatchesForCustom = itertools.tee(
+	# The HID device matches are used twice: first when looking for a custom driver,
+	# then when checking for the Braille HID protocol.
+	# By the time the second pass runs, the first one has created every match,
+	# so they are collected in a list up front rather than being created again.
+	# Devices that neither pass can match are left out.
+	usbHidDeviceMatches = [
 		DeviceMatch(ProtocolType.HID, port["usbID"], port["devicePath"], port)
-		for port in deviceInfoFetcher.hidDevices
-		if port["provider"] == CommunicationType.USB
-	)
+		for port in deviceInfoFetcher.usbHidDevices
+		if (
+			(ProtocolType.HID, port["usbID"]) in usbIndex
+			or port.get("HIDUsagePage") == HID_USAGE_PAGE_BRAILLE
+		)
+	]
 
 	fallbackDriversAndMatches: list[DriverAndDeviceMatch] = []
-	for match in itertools.chain(usbCustomDeviceMatches, usbHidDeviceMatchesForCustom, usbComDeviceMatches):
-		for driver, devs in _driverDevices.items():
+	for match in itertools.chain(usbCustomDeviceMatches, usbHidDeviceMatches, usbComDeviceMatches):
+		for driver, definition in usbIndex.get((match.type, match.id), ()):
 			if limitToDevices and driver not in limitToDevices:
 				if _isDebug():
 					log.debug("Skipping excluded driver %r for USB device match: %r", driver, match)
 				continue
-			usbDefinitions = devs[CommunicationType.USB]
-			for definition in usbDefinitions:
-				if definition.matches(match):
-					if definition.useAsFallback:
-						if _isDebug():
-							log.debug("Using USB device match %r as fallback for driver %r", match, driver)
-						fallbackDriversAndMatches.append((driver, match))
-					else:
-						yield (driver, match)
+			if definition.matches(match):
+				if definition.useAsFallback:
+					if _isDebug():
+						log.debug("Using USB device match %r as fallback for driver %r", match, driver)
+					fallbackDriversAndMatches.append((driver, match))
+				else:
+					yield (driver, match)
 
 	hidName = _getStandardHidDriverName()
 	if limitToDevices and hidName not in limitToDevices:
@@ -236,15 +314,19 @@ def getDriversForConnectedUsbDevices(
 		# Check for the Braille HID protocol after any other device matching.
 		# This ensures that a vendor specific driver is preferred over the braille HID protocol.
 		# This preference may change in the future.
-		if _isHIDBrailleMatch(match):
+		# All these matches are HID matches, so only the usage page has to be checked.
+		if match.deviceInfo.get("HIDUsagePage") == HID_USAGE_PAGE_BRAILLE:
 			yield (hidName, match)
 
 	for driver, match in fallbackDriversAndMatches:
 		yield (driver, match)
 
 
+@lru_cache(maxsize=1)
 def _getStandardHidDriverName() -> str:
-	"""Return the name of the standard HID Braille device driver"""
+	"""Return the name of the standard HID Braille device driver.
+	The result is cached, as this is called for every device match.
+	"""
 	import brailleDisplayDrivers.hidBrailleStandard
 
 	return brailleDisplayDrivers.hidBrailleStandard.HidBrailleDriver.name
@@ -279,49 +361,51 @@ def getDriversForPossibleBluetoothDevices(
 	"""
 	if limitToDevices and _isDebug():
 		log.debug("Limiting possible Bluetooth device detection to drivers: %r", limitToDevices)
-	btSerialMatchesForCustom = (
-		DeviceMatch(ProtocolType.SERIAL, port["bluetoothName"], port["port"], port)
-		for port in deviceInfoFetcher.comPorts
-		if "bluetoothName" in port
-	)
-	# Tee is used to ensure that the DeviceMatches aren't created multiple times.
-	# The processing of these HID device matches, looking for a custom driver, means that all
-	# HID device matches are created, and by teeing the output the matches don't need to be created again.
-	# The corollary is that clients of this method don't have to process all devices (and create all
-	# device matches), if one is found early the iteration can stop.
-	btHidDevMatchesForHid, btHidDevMatchesForCustom = itertools.tee(
-		DeviceMatch(ProtocolType.HID, port["hardwareID"], port["devicePath"], port)
-		for port in deviceInfoFetcher.hidDevices
-		if port["provider"] == CommunicationType.BLUETOOTH
+	limitToDevices = frozenset(limitToDevices) if limitToDevices else None
+	# Apply driver filtering to the match functions once, rather than for every match.
+	bluetoothMatchFuncs = [
+		(driver, matchFunc)
+		for driver, matchFunc in _getBluetoothMatchFuncs()
+		if not limitToDevices or driver in limitToDevices
+	]
+	hidName = _getStandardHidDriverName()
+	detectHid = not limitToDevices or hidName in limitToDevices
+	# The HID device matches are used twice: first when looking for a custom driver,
+	# then when checking for the Braille HID protocol.
+	# By the time the second pass runs, the first one has created every match,
+	# so they are collected in a list up front rather than being created again.
+	# When neither pass can match, no HID devices are fetched at all.
+	btHidDevMatches = (
+		[
+			DeviceMatch(ProtocolType.HID, port["hardwareID"], port["devicePath"], port)
+			for port in deviceInfoFetcher.bluetoothHidDevices
+		]
+		if bluetoothMatchFuncs or detectHid
+		else []
 	)
-	for match in itertools.chain(btSerialMatchesForCustom, btHidDevMatchesForCustom):
-		for driver, devs in _driverDevices.items():
-			if limitToDevices and driver not in limitToDevices:
-				continue
-			matchFunc = devs[CommunicationType.BLUETOOTH]
-			if not callable(matchFunc):
-				if _isDebug():
-					log.debugWarning(
-						"Skipping non-callable matchFunc %r for Bluetooth device match: %r",
-						matchFunc,
-						match,
-					)
-				continue
-			if matchFunc(match):
-				yield (driver, match)
+	if bluetoothMatchFuncs:
+		# Serial ports are only used to look for a custom driver.
+		btSerialMatchesForCustom = (
+			DeviceMatch(ProtocolType.SERIAL, port["bluetoothName"], port["port"], port)
+			for port in deviceInfoFetcher.bluetoothComPorts
+		)
+		for match in itertools.chain(btSerialMatchesForCustom, btHidDevMatches):
+			for driver, matchFunc in bluetoothMatchFuncs:
+				if matchFunc(match):
+					yield (driver, match)
 
-	hidName = _getStandardHidDriverName()
-	if limitToDevices and hidName not in limitToDevices:
+	if not detectHid:
 		return
-	for match in btHidDevMatchesForHid:
+	for match in btHidDevMatches:
 		# Check for the Braille HID protocol after any other device matching.
 		# This ensures that a vendor specific driver is preferred over the braille HID protocol.
 		# This preference may change in the future.
-		if _isHIDBrailleMatch(match):
+		# All these matches are HID matches, so only the usage page has to be checked.
+		if match.deviceInfo.get("HIDUsagePage") == HID_USAGE_PAGE_BRAILLE:
 			yield (hidName, match)
 
 
-type btDevsCacheT = list[DriverAndDeviceMatch] | None
+type btDevsCacheT = tuple[DriverAndDeviceMatch, ...] | None
 
 
 class _DeviceInfoFetcher(AutoPropertyObject):
@@ -330,37 +414,31 @@ class _DeviceInfoFetcher(AutoPropertyObject):
 	cachePropertiesByDefault = True
 
 	def __init__(self):
-		self._btDevsLock = threading.Lock()
-		self._btDevsCache: btDevsCacheT = None
-
-	#: Type info for auto property: _get_btDevsCache
-	btDevsCache: btDevsCacheT
-
-	def _get_btDevsCache(self) -> btDevsCacheT:
-		with self._btDevsLock:
-			if _isDebug():
-				log.debug("Fetching Bluetooth device cache")
-			return self._btDevsCache.copy() if self._btDevsCache else None
-
-	def _set_btDevsCache(
-		self,
-		cache: btDevsCacheT,
-	):
-		with self._btDevsLock:
-			if _isDebug():
-				log.debug("Setting Bluetooth device cache")
-			self._btDevsCache = cache.copy() if cache else None
+		#: The drivers and matches found by the last Bluetooth scan, or C{None} if there is no cache.
+		#: This is an immutable tuple that is only ever replaced as a whole,
+		#: so it can be read and set from any thread without further locking.
+		self.btDevsCache: btDevsCacheT = None
+		#: Device information fetched ahead of a background scan by L{_Detector._prefetchDeviceInfo},
+		#: keyed by property name.
+		#: While set, it is returned instead of enumerating devices again,
+		#: so that it survives the invalidation of the property cache by the core pump during the scan.
+		#: The dictionary is only ever replaced as a whole.
+		self._prefetched: dict[str, list[dict]] = {}
 
 	#: Type info for auto property: _get_comPorts
 	comPorts: list[dict[str, str]]
 
 	def _get_comPorts(self) -> list[dict[str, str]]:
+		if (comPorts := self._prefetched.get("comPorts")) is not None:
+			return comPorts
 		return list(hwPortUtils.listComPorts(onlyAvailable=True))
 
 	#: Type info for auto property: _get_usbDevices
 	usbDevices: list[dict]
 
 	def _get_usbDevices(self) -> list[dict]:
+		if (usbDevices := self._prefetched.get("usbDevices")) is not None:
+			return usbDevices
 		return list(hwPortUtils.listUsbDevices(onlyAvailable=True))
 
 	#: Type info for auto property: _get_usbComPorts
@@ -380,12 +458,32 @@ def _get_usbComPorts(self) -> list[dict[str, str]]:
 				comPorts.append(port | usbDict)
 		return comPorts
 
+	#: Type info for auto property: _get_bluetoothComPorts
+	bluetoothComPorts: list[dict[str, str]]
+
+	def _get_bluetoothComPorts(self) -> list[dict[str, str]]:
+		return [port for port in self.comPorts if "bluetoothName" in port]
+
 	#: Type info for auto property: _get_hidDevices
 	hidDevices: list[dict]
 
 	def _get_hidDevices(self) -> list[dict]:
+		if (hidDevices := self._prefetched.get("hidDevices")) is not None:
+			return hidDevices
 		return list(hwPortUtils.listHidDevices(onlyAvailable=True))
 
+	#: Type info for auto property: _get_usbHidDevices
+	usbHidDevices: list[dict]
+
+	def _get_usbHidDevices(self) -> list[dict]:
+		return [port for port in self.hidDevices if port["provider"] == CommunicationType.USB]
+
+	#: Type info for auto property: _get_bluetoothHidDevices
+	bluetoothHidDevices: list[dict]
+
+	def _get_bluetoothHidDevices(self) -> list[dict]:
+		return [port for port in self.hidDevices if port["provider"] == CommunicationType.BLUETOOTH]
+
 
 deviceInfoFetcher: _DeviceInfoFetcher | None = None
 
@@ -395,12 +493,19 @@ class _Detector:
 	This should only be used by the L{braille} module.
 	"""
 
+	_RESCAN_DEBOUNCE_MS = 150
+	"""Time to wait for more device changes before rescanning, in milliseconds.
+	Connecting or disconnecting a device can cause a burst of device change notifications.
+	"""
+
 	def __init__(self):
 		"""Constructor.
 		After construction, a scan should be queued with L{queueBgScan}.
 		"""
 		self._executor = ThreadPoolExecutor(1)
 		self._queuedFuture: Future | None = None
+		self._rescanCallLater: wx.CallLater | None = None
+		self._deferredBgScanArgs: dict[str, Any] | None = None
 		messageWindow.pre_handleWindowMessage.register(self.handleWindowMessage)
 		appModuleHandler.post_appSwitch.register(self.pollBluetoothDevices)
 		self._stopEvent = threading.Event()
@@ -434,6 +539,8 @@ def _queueBgScan(
 				preferredDevice,
 			)
 
+		# Any deferred scan is superseded by this one.
+		self._deferredBgScanArgs = None
 		self._detectUsb = usb
 		self._detectBluetooth = bluetooth
 		if limitToDevices is None and config.conf["braille"]["auto"]["excludedDisplays"]:
@@ -459,6 +566,43 @@ def _queueBgScan(
 			preferredDevice,
 		)
 
+	def _queueBgScanAfterStartup(
+		self,
+		usb: bool = False,
+		bluetooth: bool = False,
+		limitToDevices: list[str] | None = None,
+		preferredDevice: DriverAndDeviceMatch | None = None,
+	):
+		"""Queues a scan for devices once NVDA has finished starting.
+		Enumerating devices competes with the rest of NVDA's initialization,
+		so the first scan is deferred until L{core.postNvdaStartup}.
+		If NVDA has already started, the scan is queued immediately.
+		See L{_queueBgScan} for information about the parameters.
+		"""
+		if NVDAState._TrackNVDAInitialization.isInitializationComplete():
+			self._queueBgScan(usb, bluetooth, limitToDevices, preferredDevice)
+			return
+		import core
+
+		if _isDebug():
+			log.debug("Deferring background scan until NVDA has started")
+		self._deferredBgScanArgs = dict(
+			usb=usb,
+			bluetooth=bluetooth,
+			limitToDevices=limitToDevices,
+			preferredDevice=preferredDevice,
+		)
+		core.postNvdaStartup.register(self._queueDeferredBgScan)
+
+	def _queueDeferredBgScan(self):
+		"""Handler for L{core.postNvdaStartup} that queues the scan deferred by L{_queueBgScanAfterStartup}.
+		The handler isn't unregistered, as the action is only notified once
+		and only holds a weak reference to this detector.
+		"""
+		args = self._deferredBgScanArgs
+		if args is not None:
+			self._queueBgScan(**args)
+
 	def _stopBgScan(self):
 		"""Stops the current scan as soon as possible and prevents a queued scan to start."""
 		if _isDebug():
@@ -493,19 +637,54 @@ def _bgScanBluetooth(
 		"""
 		if not bluetooth:
 			return
-		btDevs: Iterable[DriverAndDeviceMatch] | None = deviceInfoFetcher.btDevsCache
+		btDevs = deviceInfoFetcher.btDevsCache
 		if btDevs is None:
-			btDevs = getDriversForPossibleBluetoothDevices(limitToDevices)
-			# Cache Bluetooth devices for next time.
-			btDevsCache = []
-		else:
-			btDevsCache = btDevs
+			# The cache is built without driver filtering,
+			# so that it can be reused by scans that are limited to other drivers.
+			btDevs = tuple(getDriversForPossibleBluetoothDevices())
+			# An empty cache is stored as None, so that the next scan looks for devices again.
+			deviceInfoFetcher.btDevsCache = btDevs or None
+		limitToDevices = frozenset(limitToDevices) if limitToDevices else None
 		for driver, match in btDevs:
-			if btDevsCache is not btDevs:
-				btDevsCache.append((driver, match))
+			if limitToDevices and driver not in limitToDevices:
+				continue
 			yield (driver, match)
-		if btDevsCache is not btDevs:
-			deviceInfoFetcher.btDevsCache = btDevsCache
+
+	@staticmethod
+	def _prefetchDeviceInfo(usb: bool, bluetooth: bool):
+		"""Fetch the device information needed for a scan on separate threads,
+		so that the enumerations of COM ports, USB devices and HID devices overlap.
+		The results are stored on L{deviceInfoFetcher} until L{_clearPrefetchedDeviceInfo} is called.
+		Errors are ignored here, they will be raised again when the information is fetched by the scan itself.
+		"""
+		listFuncs: dict[str, Callable[..., Iterable[dict]]] = {}
+		if usb or (bluetooth and deviceInfoFetcher.btDevsCache is None):
+			listFuncs["comPorts"] = hwPortUtils.listComPorts
+			listFuncs["hidDevices"] = hwPortUtils.listHidDevices
+		if usb:
+			listFuncs["usbDevices"] = hwPortUtils.listUsbDevices
+		if len(listFuncs) < 2:
+			return
+
+		def fetch(listFunc: Callable[..., Iterable[dict]]) -> list[dict]:
+			return list(listFunc(onlyAvailable=True))
+
+		with ThreadPoolExecutor(
+			len(listFuncs),
+			thread_name_prefix="bdDetect._prefetchDeviceInfo",
+		) as executor:
+			futures = {name: executor.submit(fetch, listFunc) for name, listFunc in listFuncs.items()}
+		deviceInfoFetcher._prefetched = {
+			name: future.result() for name, future in futures.items() if future.exception() is None
+		}
+
+	@staticmethod
+	def _clearPrefetchedDeviceInfo():
+		"""Discard the device information stored by L{_prefetchDeviceInfo},
+		so that devices are enumerated again after a scan.
+		"""
+		if deviceInfoFetcher:
+			deviceInfoFetcher._prefetched = {}
 
 	def _bgScan(
 		self,
@@ -547,24 +726,31 @@ def _bgScan(
 		if self._stopEvent.is_set():
 			return
 
-		iterator = scanForDevices.iter(
-			usb=usb,
-			bluetooth=bluetooth,
-			limitToDevices=limitToDevices,
-		)
-		for driver, match in iterator:
+		self._prefetchDeviceInfo(usb, bluetooth)
+		try:
 			if self._stopEvent.is_set():
 				return
-			if _isDebug():
-				log.debug("Processing driver %r, match %r", driver, match)
-			if braille.handler.setDisplayByName(driver, detected=match):
+
+			iterator = scanForDevices.iter(
+				usb=usb,
+				bluetooth=bluetooth,
+				limitToDevices=limitToDevices,
+			)
+			for driver, match in iterator:
+				if self._stopEvent.is_set():
+					return
 				if _isDebug():
-					log.debug("Switched to driver %r, match %r", driver, match)
-				return
-			elif _isDebug():
-				log.debug("Failed to switch to driver %r, match %r. Continuing", driver, match)
-			if self._stopEvent.is_set():
-				return
+					log.debug("Processing driver %r, match %r", driver, match)
+				if braille.handler.setDisplayByName(driver, detected=match):
+					if _isDebug():
+						log.debug("Switched to driver %r, match %r", driver, match)
+					return
+				elif _isDebug():
+					log.debug("Failed to switch to driver %r, match %r. Continuing", driver, match)
+				if self._stopEvent.is_set():
+					return
+		finally:
+			self._clearPrefetchedDeviceInfo()
 
 	def rescan(
 		self,
@@ -593,7 +779,15 @@ def rescan(
 
 	def handleWindowMessage(self, msg=None, wParam=None):
 		if msg == winUser.WM_DEVICECHANGE and wParam == DBT_DEVNODES_CHANGED:
-			self.rescan(bluetooth=self._detectBluetooth, limitToDevices=self._limitToDevices)
+			# Coalesce bursts of device changes into one rescan.
+			if self._rescanCallLater:
+				self._rescanCallLater.Restart()
+			else:
+				self._rescanCallLater = wx.CallLater(self._RESCAN_DEBOUNCE_MS, self._rescanAfterDeviceChange)
+
+	def _rescanAfterDeviceChange(self):
+		self._rescanCallLater = None
+		self.rescan(bluetooth=self._detectBluetooth, limitToDevices=self._limitToDevices)
 
 	def pollBluetoothDevices(self):
 		"""Poll bluetooth devices that might be in range.
@@ -608,6 +802,10 @@ def pollBluetoothDevices(self):
 	def terminate(self):
 		appModuleHandler.post_appSwitch.unregister(self.pollBluetoothDevices)
 		messageWindow.pre_handleWindowMessage.unregister(self.handleWindowMessage)
+		if self._rescanCallLater:
+			self._rescanCallLater.Stop()
+			self._rescanCallLater = None
+		self._deferredBgScanArgs = None
 		self._stopBgScan()
 		# Clear the cache of bluetooth devices so new devices can be picked up with a new instance.
 		deviceInfoFetcher.btDevsCache = None
@@ -627,8 +825,7 @@ def getConnectedUsbDevicesForDriver(driver: str) -> Iterator[DeviceMatch]:
 		),
 		(
 			DeviceMatch(ProtocolType.HID, port["usbID"], port["devicePath"], port)
-			for port in deviceInfoFetcher.hidDevices
-			if port["provider"] == CommunicationType.USB
+			for port in deviceInfoFetcher.usbHidDevices
 		),
 		(
 			DeviceMatch(ProtocolType.SERIAL, port["usbID"], port["port"], port)
@@ -637,19 +834,24 @@ def getConnectedUsbDevicesForDriver(driver: str) -> Iterator[DeviceMatch]:
 	)
 
 	fallbackMatches: list[DeviceMatch] = []
+	isStandardHidDriver = driver == _getStandardHidDriverName()
 
 	for match in usbDevs:
-		if driver == _getStandardHidDriverName():
+		if isStandardHidDriver:
 			if _isHIDBrailleMatch(match):
 				yield match
 		else:
-			usbDefinitions = _driverDevices[driver][CommunicationType.USB]
-			for definition in usbDefinitions:
+			if driver not in _driverDevices:
+				raise LookupError(f"No detection data for driver {driver!r}")
+			for registeredDriver, definition in _getUsbIndex().get((match.type, match.id), ()):
+				if registeredDriver != driver:
+					continue
 				if definition.matches(match):
 					if definition.useAsFallback:
 						fallbackMatches.append(match)
 					else:
 						yield match
+					break
 
 	for match in fallbackMatches:
 		yield match
@@ -664,19 +866,18 @@ def getPossibleBluetoothDevicesForDriver(driver: str) -> Iterator[DeviceMatch]:
 	if driver == _getStandardHidDriverName():
 		matchFunc = _isHIDBrailleMatch
 	else:
-		matchFunc = _driverDevices[driver][CommunicationType.BLUETOOTH]
+		# Use get, so that no empty set is added for drivers without a Bluetooth match function.
+		matchFunc = _driverDevices[driver].get(CommunicationType.BLUETOOTH)
 		if not callable(matchFunc):
 			return
 	btDevs = itertools.chain(
 		(
 			DeviceMatch(ProtocolType.SERIAL, port["bluetoothName"], port["port"], port)
-			for port in deviceInfoFetcher.comPorts
-			if "bluetoothName" in port
+			for port in deviceInfoFetcher.bluetoothComPorts
 		),
 		(
 			DeviceMatch(ProtocolType.HID, port["hardwareID"], port["devicePath"], port)
-			for port in deviceInfoFetcher.hidDevices
-			if port["provider"] == CommunicationType.BLUETOOTH
+			for port in deviceInfoFetcher.bluetoothHidDevices
 		),
 	)
 	for match in btDevs:
@@ -754,12 +955,14 @@ def initialize():
 		display.registerAutomaticDetection(DriverRegistrar(display.name))
 	# Hack, Caiku Albatross detection conflicts with other drivers
 	# when it isn't the last driver in the detection logic.
-	_driverDevices.move_to_end("albatross")
+	_driverDevices["albatross"] = _driverDevices.pop("albatross")
+	_driverDevicesChanged()
 
 
 def terminate():
 	global deviceInfoFetcher
 	_driverDevices.clear()
+	_driverDevicesChanged()
 	scanForDevices.unregister(_Detector._bgScanBluetooth)
 	scanForDevices.unregister(_Detector._bgScanUsb)
 	deviceInfoFetcher = None
@@ -815,6 +1018,7 @@ def addUsbDevice(
 		driverUsb.add(
 			_UsbDeviceRegistryEntry(id=id, type=type, useAsFallback=useAsFallback, matchFunc=matchFunc),
 		)
+		_driverDevicesChanged()
 
 	def addUsbDevices(
 		self,
@@ -839,8 +1043,9 @@ def addUsbDevices(
 			It can be used to further constrain device registrations, such as for a specific HID usage page.
 		:raise ValueError: When one of the provided IDs is malformed.
 		"""
-		malformedIds = [id for id in ids if not isinstance(id, str) or not USB_ID_REGEX.match(id)]
-		if malformedIds:
+		if not all(isinstance(id, str) and USB_ID_REGEX.match(id) for id in ids):
+			# Only collect the malformed IDs for the error message once validation has failed.
+			malformedIds = [str(id) for id in ids if not isinstance(id, str) or not USB_ID_REGEX.match(id)]
 			raise ValueError(
 				f"Invalid IDs provided for driver {self._driver!r}, type {type!r}: {', '.join(malformedIds)}",
 			)
@@ -850,6 +1055,7 @@ def addUsbDevices(
 			_UsbDeviceRegistryEntry(id=id, type=type, useAsFallback=useAsFallback, matchFunc=matchFunc)
 			for id in ids
 		)
+		_driverDevicesChanged()
 
 	def addBluetoothDevices(self, matchFunc: MatchFuncT):
 		"""Associate Bluetooth HID or COM ports with the driver on this instance.
@@ -859,6 +1065,7 @@ def addBluetoothDevices(self, matchFunc: MatchFuncT):
 		"""
 		devs = self._getDriverDict()
 		devs[CommunicationType.BLUETOOTH] = matchFunc
+		_driverDevicesChanged()
 
 	def addDeviceScanner(
 		self,
@@ -3406,7 +3406,7 @@ def _enableDetection(
 			return
 		config.conf["braille"]["display"] = AUTO_DISPLAY_NAME
 		self._detector = bdDetect._Detector()
-		self._detector._queueBgScan(
+		self._detector._queueBgScanAfterStartup(
 			usb=usb,
 			bluetooth=bluetooth,
 			limitToDevices=limitToDevices,
@@ -135,9 +135,8 @@ def registerAutomaticDetection(cls, driverRegistrar: bdDetect.DriverRegistrar):
 		)
 
 		driverRegistrar.addBluetoothDevices(
-			lambda m: any(
-				m.id.startswith(prefix)
-				for prefix in (
+			lambda m: m.id.startswith(
+				(
 					"Baum SuperVario",
 					"Baum PocketVario",
 					"Baum SVario",
@@ -150,7 +149,7 @@ def registerAutomaticDetection(cls, driverRegistrar: bdDetect.DriverRegistrar):
 					"Orbit Reader 20",
 					"Orbit Reader 40",
 					"Vario 4",
-				)
+				),
 			),
 		)
 
@@ -120,6 +120,24 @@
 }
 
 
+#: Inclusive ranges of Bluetooth addresses used by BrailleNote devices.
+BLUETOOTH_ADDRESS_RANGES = (
+	(0x0025EC000000, 0x0025EC01869F),  # Apex
+)
+
+
+def isBluetoothDeviceMatch(match: bdDetect.DeviceMatch) -> bool:
+	"""Returns whether a Bluetooth device is a BrailleNote.
+	This is the case when its Bluetooth address is in one of the L{BLUETOOTH_ADDRESS_RANGES},
+	or when its identifier starts with "Braillenote".
+	"""
+	address = match.deviceInfo.get("bluetoothAddress", 0)
+	for first, last in BLUETOOTH_ADDRESS_RANGES:
+		if first <= address <= last:
+			return True
+	return match.id.startswith("Braillenote")
+
+
 class BrailleDisplayDriver(braille.BrailleDisplayDriver):
 	name = "brailleNote"
 	# Translators: Names of braille displays
@@ -135,17 +153,7 @@ def registerAutomaticDetection(cls, driverRegistrar: bdDetect.DriverRegistrar):
 				"VID_1C71&PID_C004",  # Apex
 			},
 		)
-		driverRegistrar.addBluetoothDevices(
-			lambda m: (
-				any(
-					first <= m.deviceInfo.get("bluetoothAddress", 0) <= last
-					for first, last in (
-						(0x0025EC000000, 0x0025EC01869F),  # Apex
-					)
-				)
-				or m.id.startswith("Braillenote")
-			),
-		)
+		driverRegistrar.addBluetoothDevices(isBluetoothDeviceMatch)
 
 	@classmethod
 	def getManualPorts(cls):
@@ -209,14 +209,13 @@ def registerAutomaticDetection(cls, driverRegistrar: bdDetect.DriverRegistrar):
 		)
 
 		driverRegistrar.addBluetoothDevices(
-			lambda m: any(
-				m.id.startswith(prefix)
-				for prefix in (
+			lambda m: m.id.startswith(
+				(
 					"F14",
 					"Focus 14 BT",
 					"Focus 40 BT",
 					"Focus 80 BT",
-				)
+				),
 			),
 		)
 
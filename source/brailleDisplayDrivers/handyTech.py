@@ -732,9 +732,8 @@ def registerAutomaticDetection(cls, driverRegistrar: bdDetect.DriverRegistrar):
 		)
 
 		driverRegistrar.addBluetoothDevices(
-			lambda m: any(
-				m.id.startswith(prefix)
-				for prefix in (
+			lambda m: m.id.startswith(
+				(
 					"Actilino AL",
 					"Active Braille AB",
 					"Active Star AS",
@@ -745,7 +744,7 @@ def registerAutomaticDetection(cls, driverRegistrar: bdDetect.DriverRegistrar):
 					"Braille Wave BW",
 					"Easy Braille EBR",
 					"Activator",
-				)
+				),
 			),
 		)
 
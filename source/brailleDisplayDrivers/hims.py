@@ -307,13 +307,12 @@ def registerAutomaticDetection(cls, driverRegistrar: bdDetect.DriverRegistrar):
 			driverRegistrar.addUsbDevices(deviceType, ids, useAsFallback)
 
 		driverRegistrar.addBluetoothDevices(
-			lambda m: any(
-				m.id.startswith(prefix)
-				for prefix in (
+			lambda m: m.id.startswith(
+				(
 					"BrailleSense",
 					"BrailleEDGE",
 					"SmartBeetle",
-				)
+				),
 			),
 		)
 
@@ -172,7 +172,14 @@ def translate(
 	)
 	# liblouis gives us back a character string of cells, so convert it to a list of ints.
 	# For some reason, the highest bit is set, so only grab the lower 8 bits.
-	braille = [ord(cell) & 255 for cell in braille]
+	# The low byte of every UTF-16 code unit is exactly that,
+	# so slicing the little endian encoding does the conversion without a Python level loop.
+	cells = braille.encode("utf-16-le", "surrogatepass")[::2]
+	if len(cells) == len(braille):
+		braille = list(cells)
+	else:
+		# Characters outside the BMP take two code units, fall back to converting cell by cell.
+		braille = [ord(cell) & 255 for cell in braille]
 	if cursorPos is None:
 		brailleCursorPos = None
 	return braille, brailleToRawPos, rawToBraillePos, brailleCursorPos
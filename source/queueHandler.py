@@ -6,6 +6,7 @@
 
 import types
 from queue import SimpleQueue
+from typing import Any, Callable, Iterable
 from logHandler import log
 import watchdog
 import core
@@ -53,6 +54,26 @@ def queueFunction(queue, func, *args, _immediate: bool = False, **kwargs):
 	core.requestPump(immediate=_immediate)
 
 
+def _queueFunctions(
+	queue,
+	calls: Iterable[tuple[Callable, tuple, dict[str, Any]]],
+	_immediate: bool = False,
+):
+	"""Queue several functions to be executed in order in a specific queue,
+	requesting a single pump for all of them.
+	@param queue: The queue to use. Currently, this can only be
+		L{queueHandler.eventQueue}.
+	@param calls: The functions to run, each given as a tuple of the function,
+		its positional arguments and its keyword arguments.
+	@param _immediate: Whether to run these as soon as possible (e.g. input) or
+		to delay them slightly (e.g. events). See the immediate argument to
+		L{core.requestPump}.
+	"""
+	for call in calls:
+		queue.put_nowait(call)
+	core.requestPump(immediate=_immediate)
+
+
 def isRunningGenerators():
 	res = len(generators) > 0
 	log.debug("generators running: %s" % res)
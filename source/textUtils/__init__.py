@@ -10,8 +10,10 @@
 import ctypes
 import encodings
 import locale
+import re
 import unicodedata
 from abc import ABCMeta, abstractmethod, abstractproperty
+from bisect import bisect_left, bisect_right
 from functools import cached_property
 from typing import Generator, Optional, Tuple, Type
 
@@ -122,14 +124,49 @@ class WideStringOffsetConverter(OffsetConverter):
 	_encoding: str = WCHAR_ENCODING
 	_bytesPerIndex: int = ctypes.sizeof(ctypes.c_wchar)
 
-	def __init__(self, text: str):
-		super().__init__(text)
-		self.encoded: bytes = text.encode(self._encoding, errors="surrogatepass")
+	@cached_property
+	def encoded(self) -> bytes:
+		"""The string in its wide character (UTF-16) representation.
+		Encoded on first access, as offset conversions don't need it for most strings.
+		"""
+		return self.decoded.encode(self._encoding, errors="surrogatepass")
+
+	@cached_property
+	def _encodedStringLength(self) -> int:
+		astralStrOffsets = self._astralStrOffsets
+		if astralStrOffsets is not None:
+			# Every character outside the BMP takes two offsets in the wide character representation.
+			return self.strLength + len(astralStrOffsets)
+		return len(self.encoded) // self._bytesPerIndex
 
 	@property
 	def encodedStringLength(self) -> int:
 		"""Returns the length of the string in its wide character (UTF-16) representation."""
-		return len(self.encoded) // self._bytesPerIndex
+		return self._encodedStringLength
+
+	@cached_property
+	def _astralStrOffsets(self) -> list[int] | None:
+		"""The sorted str offsets of characters outside the Basic Multilingual Plane,
+		i.e. the characters that take two offsets in the wide character representation.
+		C{None} when the string contains surrogate characters itself,
+		in which case offsets are calculated by encoding and decoding parts of the string.
+		"""
+		if self.decoded.isascii():
+			# Optimisation for the most common case, str offsets and wide offsets are equal.
+			return []
+		if _RE_SURROGATE_CHAR.search(self.decoded):
+			return None
+		return [match.start() for match in _RE_ASTRAL_CHAR.finditer(self.decoded)]
+
+	@cached_property
+	def _astralWideOffsets(self) -> list[int] | None:
+		"""The sorted wide character offsets of the high surrogates of characters outside the BMP.
+		C{None} when the string contains surrogate characters itself, see L{_astralStrOffsets}.
+		"""
+		astralStrOffsets = self._astralStrOffsets
+		if astralStrOffsets is None:
+			return None
+		return [offset + index for index, offset in enumerate(astralStrOffsets)]
 
 	def strToEncodedOffsets(
 		self,
@@ -153,6 +190,16 @@ def strToEncodedOffsets(
 		# Optimisation, don't do anything special if offsets are collapsed at the start.
 		if 0 == strEnd == strStart:
 			return (0, 0)
+		astralStrOffsets = self._astralStrOffsets
+		if astralStrOffsets is not None:
+			# Every character outside the BMP before an offset shifts the wide offset by one.
+			wideStringStart: int = strStart + bisect_left(astralStrOffsets, strStart)
+			if strEnd is None:
+				return wideStringStart
+			strEnd = max(0, min(strEnd, self.strLength))
+			if strStart == strEnd:
+				return (wideStringStart, wideStringStart)
+			return (wideStringStart, strEnd + bisect_left(astralStrOffsets, strEnd))
 		# If the original string contains surrogate characters, we want to preserve them
 		if strStart == 0:
 			wideStringStart: int = 0
@@ -202,6 +249,14 @@ def encodedToStrOffsets(
 		super().encodedToStrOffsets(encodedStart, encodedEnd, raiseOnError)
 		encodedStart = max(0, min(encodedStart, self.encodedStringLength))
 		encodedEnd = max(0, min(encodedEnd, self.encodedStringLength))
+		astralWideOffsets = self._astralWideOffsets
+		if astralWideOffsets is not None:
+			# A start offset in the middle of a surrogate pair maps to the str offset of the pair,
+			# an end offset in the middle of a surrogate pair maps to the str offset after the pair.
+			strStart = encodedStart - bisect_left(astralWideOffsets, encodedStart)
+			if encodedStart == encodedEnd:
+				return (strStart, strStart)
+			return (strStart, encodedEnd - bisect_right(astralWideOffsets, encodedEnd - 2))
 		bytesStart: int = encodedStart * self._bytesPerIndex
 		bytesEnd: int = encodedEnd * self._bytesPerIndex
 		precedingStr = self.encoded[:bytesStart].decode(self._encoding, errors="surrogatepass")
@@ -222,9 +277,9 @@ def encodedToStrOffsets(
 		# They take one offset in the resulting string, so our offsets are off by one.
 		if (
 			precedingStr
-			and isHighSurrogate(precedingStr[-1])
+			and _HIGH_SURROGATE_FIRST_ORD <= ord(precedingStr[-1]) <= _HIGH_SURROGATE_LAST_ORD
 			and decodedRange
-			and isLowSurrogate(decodedRange[0])
+			and _LOW_SURROGATE_FIRST_ORD <= ord(decodedRange[0]) <= _LOW_SURROGATE_LAST_ORD
 		):
 			strStart -= 1
 			strEnd -= 1
@@ -305,6 +360,17 @@ def isLowSurrogate(ch: str) -> bool:
 	return LOW_SURROGATE_FIRST <= ch <= LOW_SURROGATE_LAST
 
 
+# Code points of the surrogate ranges, to compare ord() of a single character against.
+_HIGH_SURROGATE_FIRST_ORD = ord(HIGH_SURROGATE_FIRST)
+_HIGH_SURROGATE_LAST_ORD = ord(HIGH_SURROGATE_LAST)
+_LOW_SURROGATE_FIRST_ORD = ord(LOW_SURROGATE_FIRST)
+_LOW_SURROGATE_LAST_ORD = ord(LOW_SURROGATE_LAST)
+#: Matches surrogate characters that are part of a str.
+_RE_SURROGATE_CHAR = re.compile(f"[{HIGH_SURROGATE_FIRST}-{LOW_SURROGATE_LAST}]")
+#: Matches characters outside the Basic Multilingual Plane, encoded as a surrogate pair in UTF-16.
+_RE_ASTRAL_CHAR = re.compile("[\U00010000-\U0010ffff]")
+
+
 #: ￼ OBJECT REPLACEMENT CHARACTER,
 # placeholder in the text for another unspecified object, for example in a compound document.
 # https://en.wikipedia.org/wiki/Specials_(Unicode_block)
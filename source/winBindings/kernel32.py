@@ -317,6 +317,19 @@ class WAIT(IntEnum):
 )
 DuplicateHandle.restype = BOOL
 
+SetHandleInformation = WINFUNCTYPE(None)(("SetHandleInformation", dll))
+"""
+Sets certain properties of an object handle.
+.. seealso::
+	https://learn.microsoft.com/en-us/windows/win32/api/handleapi/nf-handleapi-sethandleinformation
+"""
+SetHandleInformation.argtypes = (
+	HANDLE,  # hObject
+	DWORD,  # dwMask
+	DWORD,  # dwFlags
+)
+SetHandleInformation.restype = BOOL
+
 GlobalAlloc = WINFUNCTYPE(None)(("GlobalAlloc", dll))
 """
 Allocates global memory and returns a handle to the allocated memory.
@@ -110,6 +110,8 @@
 IMAGE_FILE_MACHINE_UNKNOWN = 0
 # LoadLibraryEx constants
 LOAD_WITH_ALTERED_SEARCH_PATH = 0x8
+LOAD_LIBRARY_SEARCH_DLL_LOAD_DIR = 0x100
+LOAD_LIBRARY_SEARCH_DEFAULT_DIRS = 0x1000
 
 
 def GetStdHandle(handleID):
@@ -501,6 +503,14 @@ def DuplicateHandle(
 	return targetHandle.value
 
 
+HANDLE_FLAG_INHERIT = 0x00000001
+
+
+def SetHandleInformation(handle, mask, flags):
+	if winBindings.kernel32.SetHandleInformation(handle, mask, flags) == 0:
+		raise WinError()
+
+
 THREAD_SET_CONTEXT = 16
 
 GMEM_MOVEABLE = 2
@@ -0,0 +1,69 @@
+# A part of NonVisual Desktop Access (NVDA)
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2026 NV Access Limited, Leonard de Ruijter
+
+"""Unit tests for the XMLFormatting module."""
+
+import unittest
+from unittest.mock import patch
+
+import textInfos
+from XMLFormatting import XMLTextParser
+
+HIGH_SURROGATE = "\ud83e"
+LOW_SURROGATE = "\udd26"
+FACE_PALM = "\U0001f926"  # 🤦, HIGH_SURROGATE followed by LOW_SURROGATE in UTF-16
+
+
+def unich(ch: str) -> str:
+	return f'<unich value="{ord(ch)}"/>'
+
+
+class TestXMLTextParserSurrogates(unittest.TestCase):
+	"""Tests for the handling of surrogate characters passed as unich elements."""
+
+	def _parse(self, xml: str) -> list[textInfos.FieldCommand | str]:
+		with patch("XMLFormatting.log.error") as logError:
+			commands = XMLTextParser().parse(f"<control>{xml}</control>")
+		logError.assert_not_called()
+		return commands
+
+	def _getText(self, xml: str) -> list[str]:
+		return [command for command in self._parse(xml) if isinstance(command, str)]
+
+	def test_surrogatePair(self):
+		"""A pair of unich elements directly following each other is combined into one character."""
+		self.assertEqual(self._getText(unich(HIGH_SURROGATE) + unich(LOW_SURROGATE)), [FACE_PALM])
+
+	def test_surrogatePairWithCharacterData(self):
+		"""A pair of unich elements surrounded by character data is combined into one character."""
+		pair = unich(HIGH_SURROGATE) + unich(LOW_SURROGATE)
+		xml = f"ab{pair}c&amp;{pair}"
+		self.assertEqual(self._getText(xml), [f"ab{FACE_PALM}c&{FACE_PALM}"])
+
+	def test_loneLowSurrogate(self):
+		"""A low surrogate that doesn't follow a high surrogate is kept and parsing continues."""
+		xml = f"a{unich(LOW_SURROGATE)}b<control>c</control>"
+		commands = self._parse(xml)
+		self.assertEqual(
+			[command for command in commands if isinstance(command, str)],
+			[f"a{LOW_SURROGATE}b", "c"],
+		)
+		self.assertEqual(
+			[command.command for command in commands if isinstance(command, textInfos.FieldCommand)],
+			["controlStart", "controlStart", "controlEnd", "controlEnd"],
+		)
+
+	def test_loneLowSurrogateAfterCharacterData(self):
+		"""A low surrogate separated from a high surrogate by character data isn't combined with it."""
+		xml = f"{unich(HIGH_SURROGATE)}a{unich(LOW_SURROGATE)}"
+		self.assertEqual(self._getText(xml), [f"{HIGH_SURROGATE}a{LOW_SURROGATE}"])
+
+	def test_loneTrailingHighSurrogate(self):
+		"""A high surrogate at the end of the text is kept."""
+		self.assertEqual(self._getText(f"a{unich(HIGH_SURROGATE)}"), [f"a{HIGH_SURROGATE}"])
+		self.assertEqual(
+			self._getText(f"<control>a{unich(HIGH_SURROGATE)}</control>b"),
+			[f"a{HIGH_SURROGATE}", "b"],
+		)
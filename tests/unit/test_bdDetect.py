@@ -6,9 +6,13 @@
 """Unit tests for the bdDetect module."""
 
 import unittest
+from unittest.mock import patch
 import bdDetect
+import core
+import NVDAState
 from .extensionPointTestHelpers import chainTester
 import braille
+import winUser
 from utils.blockUntilConditionMet import blockUntilConditionMet
 
 
@@ -24,6 +28,8 @@ def test_scanForDevices(self):
 			**kwargs,
 		):
 			braille.handler._enableDetection(**kwargs)
+			# The first scan is deferred until NVDA has started, which doesn't happen in unit tests.
+			core.postNvdaStartup.notify()
 			# wait for the detector to be terminated.
 			success, _endTimeOrNone = blockUntilConditionMet(
 				getValue=lambda: braille.handler._detector,
@@ -38,6 +44,7 @@ class TestDriverRegistration(unittest.TestCase):
 
 	def tearDown(self):
 		bdDetect._driverDevices.clear()
+		bdDetect._driverDevicesChanged()
 
 	def test_addUsbDevice(self):
 		"""Test adding a USB device."""
@@ -99,3 +106,181 @@ def matchFunc(match: bdDetect.DeviceMatch) -> bool:
 
 		registrar.addBluetoothDevices(matchFunc)
 		self.assertEqual(registrar._getDriverDict().get(bdDetect.CommunicationType.BLUETOOTH), matchFunc)
+
+	def test_indexesRebuiltAfterRegistrationChanges(self):
+		"""Test that the indexes derived from the registrations follow changes to them."""
+		registrar = bdDetect.DriverRegistrar("fakeDriver")
+		firstKey = (bdDetect.ProtocolType.HID, "VID_1234&PID_5678")
+		registrar.addUsbDevice(*firstKey)
+		self.assertEqual([driver for driver, _entry in bdDetect._getUsbIndex()[firstKey]], ["fakeDriver"])
+		self.assertEqual(bdDetect._getBluetoothMatchFuncs(), [])
+
+		bdDetect._driverDevices.clear()
+		bdDetect._driverDevicesChanged()
+		self.assertEqual(bdDetect._getUsbIndex(), {})
+
+		def matchFunc(match: bdDetect.DeviceMatch) -> bool:
+			return True
+
+		secondKey = (bdDetect.ProtocolType.SERIAL, "VID_8765&PID_4321")
+		registrar.addUsbDevice(*secondKey)
+		registrar.addBluetoothDevices(matchFunc)
+		usbIndex = bdDetect._getUsbIndex()
+		self.assertNotIn(firstKey, usbIndex)
+		self.assertEqual([driver for driver, _entry in usbIndex[secondKey]], ["fakeDriver"])
+		self.assertEqual(bdDetect._getBluetoothMatchFuncs(), [("fakeDriver", matchFunc)])
+
+	def test_bluetoothMatchFuncsSkipDriversWithoutMatchFunc(self):
+		"""Test that drivers without a Bluetooth match function are skipped without a warning."""
+		registrar = bdDetect.DriverRegistrar("fakeDriver")
+		registrar.addUsbDevice(bdDetect.ProtocolType.HID, "VID_1234&PID_5678")
+		# Indexing the defaultdict of a driver without a Bluetooth match function leaves an empty set.
+		registrar._getDriverDict()[bdDetect.CommunicationType.BLUETOOTH] = set()
+		bdDetect._driverDevicesChanged()
+		with patch.object(bdDetect.log, "debugWarning") as debugWarning:
+			self.assertEqual(bdDetect._getBluetoothMatchFuncs(), [])
+		debugWarning.assert_not_called()
+
+		registrar._getDriverDict()[bdDetect.CommunicationType.BLUETOOTH] = "notCallable"
+		bdDetect._driverDevicesChanged()
+		with patch.object(bdDetect.log, "debugWarning") as debugWarning:
+			self.assertEqual(bdDetect._getBluetoothMatchFuncs(), [])
+		debugWarning.assert_called_once()
+
+
+class TestDetectorDeviceChanges(unittest.TestCase):
+	"""Tests for rescanning after device change notifications."""
+
+	def setUp(self):
+		self.detector = bdDetect._Detector()
+		self.addCleanup(self.detector.terminate)
+
+	def _sendDeviceChange(self, wParam: int = bdDetect.DBT_DEVNODES_CHANGED):
+		self.detector.handleWindowMessage(msg=winUser.WM_DEVICECHANGE, wParam=wParam)
+
+	@patch("bdDetect.wx.CallLater")
+	def test_deviceChangesDebounced(self, callLater):
+		"""Test that a burst of device changes results in a single rescan."""
+		with patch.object(self.detector, "rescan") as rescan:
+			self._sendDeviceChange(wParam=0)
+			callLater.assert_not_called()
+			self._sendDeviceChange()
+			self._sendDeviceChange()
+			callLater.assert_called_once_with(
+				bdDetect._Detector._RESCAN_DEBOUNCE_MS,
+				self.detector._rescanAfterDeviceChange,
+			)
+			callLater.return_value.Restart.assert_called_once_with()
+			rescan.assert_not_called()
+			# Simulate the timer firing.
+			callLater.call_args.args[1]()
+			rescan.assert_called_once_with(
+				bluetooth=self.detector._detectBluetooth,
+				limitToDevices=self.detector._limitToDevices,
+			)
+		self.assertIsNone(self.detector._rescanCallLater)
+
+	@patch("bdDetect.wx.CallLater")
+	def test_terminateStopsPendingRescan(self, callLater):
+		"""Test that terminating the detector stops a pending rescan."""
+		self._sendDeviceChange()
+		callLater.assert_called_once()
+		self.detector.terminate()
+		callLater.return_value.Stop.assert_called_once_with()
+		self.assertIsNone(self.detector._rescanCallLater)
+
+
+@patch.object(NVDAState._TrackNVDAInitialization, "isInitializationComplete", return_value=False)
+class TestDetectorDeferredScan(unittest.TestCase):
+	"""Tests for deferring the first scan until NVDA has started."""
+
+	SCAN_ARGS = dict(usb=False, bluetooth=True, limitToDevices=["noBraille"], preferredDevice=None)
+
+	def setUp(self):
+		self.detector = bdDetect._Detector()
+		self.addCleanup(self.detector.terminate)
+
+	def test_scanDeferredUntilStartup(self, isInitializationComplete):
+		with patch.object(self.detector, "_queueBgScan") as queueBgScan:
+			self.detector._queueBgScanAfterStartup(**self.SCAN_ARGS)
+			queueBgScan.assert_not_called()
+			self.assertEqual(self.detector._deferredBgScanArgs, self.SCAN_ARGS)
+			core.postNvdaStartup.notify()
+			queueBgScan.assert_called_once_with(**self.SCAN_ARGS)
+
+	def test_scanQueuedWhenStarted(self, isInitializationComplete):
+		isInitializationComplete.return_value = True
+		with patch.object(self.detector, "_queueBgScan") as queueBgScan:
+			self.detector._queueBgScanAfterStartup(**self.SCAN_ARGS)
+			queueBgScan.assert_called_once_with(False, True, ["noBraille"], None)
+		self.assertIsNone(self.detector._deferredBgScanArgs)
+
+	def test_queueBgScanSupersedesDeferredScan(self, isInitializationComplete):
+		self.detector._queueBgScanAfterStartup(**self.SCAN_ARGS)
+		self.assertIsNotNone(self.detector._deferredBgScanArgs)
+		self.detector._queueBgScan(usb=False, bluetooth=False, limitToDevices=["noBraille"])
+		self.assertIsNone(self.detector._deferredBgScanArgs)
+		with patch.object(self.detector, "_queueBgScan") as queueBgScan:
+			core.postNvdaStartup.notify()
+			queueBgScan.assert_not_called()
+
+	def test_terminateCancelsDeferredScan(self, isInitializationComplete):
+		self.detector._queueBgScanAfterStartup(**self.SCAN_ARGS)
+		self.assertIsNotNone(self.detector._deferredBgScanArgs)
+		self.detector.terminate()
+		self.assertIsNone(self.detector._deferredBgScanArgs)
+		with patch.object(self.detector, "_queueBgScan") as queueBgScan:
+			core.postNvdaStartup.notify()
+			queueBgScan.assert_not_called()
+
+
+class TestPrefetchDeviceInfo(unittest.TestCase):
+	"""Tests for fetching device information ahead of a background scan."""
+
+	COM_PORTS = [{"port": "COM3", "usbID": "VID_1234&PID_5678"}]
+	HID_DEVICES = [{"devicePath": "hid", "provider": "usb", "usbID": "VID_1234&PID_5678"}]
+	USB_DEVICES = [{"devicePath": "usb", "usbID": "VID_1234&PID_5678"}]
+
+	def setUp(self):
+		self.fetcher = bdDetect.deviceInfoFetcher
+		self.fetcher.invalidateCache()
+		patchers = (
+			patch("hwPortUtils.listComPorts", side_effect=lambda onlyAvailable: iter(self.COM_PORTS)),
+			patch("hwPortUtils.listHidDevices", side_effect=lambda onlyAvailable: iter(self.HID_DEVICES)),
+			patch("hwPortUtils.listUsbDevices", side_effect=lambda onlyAvailable: iter(self.USB_DEVICES)),
+		)
+		self.listComPorts, self.listHidDevices, self.listUsbDevices = (
+			patcher.start() for patcher in patchers
+		)
+		for patcher in patchers:
+			self.addCleanup(patcher.stop)
+		self.addCleanup(self.fetcher.invalidateCache)
+		self.addCleanup(bdDetect._Detector._clearPrefetchedDeviceInfo)
+
+	def test_prefetchedDeviceInfoOutlivesPropertyCache(self):
+		"""Test that prefetched information is used after the property cache is invalidated."""
+		bdDetect._Detector._prefetchDeviceInfo(usb=True, bluetooth=False)
+		for listFunc in (self.listComPorts, self.listHidDevices, self.listUsbDevices):
+			listFunc.assert_called_once_with(onlyAvailable=True)
+		# The core pump invalidates the property cache.
+		self.fetcher.invalidateCache()
+		self.assertEqual(self.fetcher.comPorts, self.COM_PORTS)
+		self.assertEqual(self.fetcher.hidDevices, self.HID_DEVICES)
+		self.assertEqual(self.fetcher.usbDevices, self.USB_DEVICES)
+		self.assertEqual(len(self.fetcher.usbComPorts), 1)
+		for listFunc in (self.listComPorts, self.listHidDevices, self.listUsbDevices):
+			listFunc.assert_called_once()
+
+	def test_clearPrefetchedDeviceInfo(self):
+		"""Test that devices are enumerated again once the prefetched information is cleared."""
+		bdDetect._Detector._prefetchDeviceInfo(usb=True, bluetooth=False)
+		bdDetect._Detector._clearPrefetchedDeviceInfo()
+		self.fetcher.invalidateCache()
+		self.assertEqual(self.fetcher.comPorts, self.COM_PORTS)
+		self.assertEqual(self.listComPorts.call_count, 2)
+
+	def test_noPrefetchForSingleEnumeration(self):
+		"""Test that nothing is prefetched when a scan needs fewer than two enumerations."""
+		bdDetect._Detector._prefetchDeviceInfo(usb=False, bluetooth=False)
+		self.listComPorts.assert_not_called()
+		self.assertEqual(self.fetcher._prefetched, {})
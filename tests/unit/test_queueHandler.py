@@ -0,0 +1,54 @@
+# A part of NonVisual Desktop Access (NVDA)
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2026 NV Access Limited, Leonard de Ruijter
+
+"""Unit tests for the queueHandler module."""
+
+import unittest
+from queue import SimpleQueue
+from unittest.mock import patch
+
+import queueHandler
+
+
+class TestQueueFunctions(unittest.TestCase):
+	"""Tests for queueing several functions at once."""
+
+	def test_flushRunsCallsInOrder(self):
+		queue = SimpleQueue()
+		calls = []
+
+		def first(*args, **kwargs):
+			calls.append(("first", args, kwargs))
+
+		def second(*args, **kwargs):
+			calls.append(("second", args, kwargs))
+
+		with patch("core.requestPump") as requestPump:
+			queueHandler._queueFunctions(
+				queue,
+				(
+					(first, (1, 2), {"a": 3}),
+					(second, (), {}),
+					(first, ("x",), {}),
+				),
+			)
+		requestPump.assert_called_once_with(immediate=False)
+		self.assertEqual(calls, [])
+		queueHandler.flushQueue(queue)
+		self.assertEqual(
+			calls,
+			[
+				("first", (1, 2), {"a": 3}),
+				("second", (), {}),
+				("first", ("x",), {}),
+			],
+		)
+		self.assertTrue(queue.empty())
+
+	def test_immediate(self):
+		queue = SimpleQueue()
+		with patch("core.requestPump") as requestPump:
+			queueHandler._queueFunctions(queue, ((print, (), {}),), _immediate=True)
+		requestPump.assert_called_once_with(immediate=True)
@@ -201,6 +201,153 @@ def test_mixedSurrogatePairsNonSurrogatesAndSingleSurrogates(self):
 		self.assertEqual(converter.wideToStrOffsets(6, 6), (5, 5))
 
 
+class TestAstralCharacterOffsets(unittest.TestCase):
+	"""
+	Tests for the tables of characters outside the Basic Multilingual Plane,
+	which WideStringOffsetConverter uses to convert offsets without encoding or decoding the string.
+	"""
+
+	def test_ascii(self):
+		converter = WideStringOffsetConverter(text="abc")
+		self.assertEqual(converter._astralStrOffsets, [])
+		self.assertEqual(converter._astralWideOffsets, [])
+		self.assertEqual(converter.wideStringLength, 3)
+		self.assertEqual(converter.strToWideOffsets(1, 3), (1, 3))
+		self.assertEqual(converter.wideToStrOffsets(1, 3), (1, 3))
+		# The conversions don't need the encoded string.
+		self.assertNotIn("encoded", vars(converter))
+		self.assertEqual(converter.encoded, "abc".encode("utf_16_le"))
+
+	def test_bmpOnly(self):
+		text = "é中ß"
+		converter = WideStringOffsetConverter(text=text)
+		self.assertEqual(converter._astralStrOffsets, [])
+		self.assertEqual(converter._astralWideOffsets, [])
+		self.assertEqual(converter.wideStringLength, 3)
+		self.assertEqual(converter.strToWideOffsets(0, 3), (0, 3))
+		self.assertEqual(converter.strToWideOffsets(1, 2), (1, 2))
+		self.assertEqual(converter.wideToStrOffsets(0, 3), (0, 3))
+		self.assertEqual(converter.wideToStrOffsets(2, 2), (2, 2))
+		self.assertNotIn("encoded", vars(converter))
+
+	def test_severalAstralCharacters(self):
+		converter = WideStringOffsetConverter(text="a" + FACE_PALM + "b" + SMILE + THUMBS_UP)
+		self.assertEqual(converter._astralStrOffsets, [1, 3, 4])
+		self.assertEqual(converter._astralWideOffsets, [1, 4, 6])
+		self.assertEqual(converter.wideStringLength, 8)
+		self.assertEqual(converter.strToWideOffsets(0, 1), (0, 1))
+		self.assertEqual(converter.strToWideOffsets(1, 2), (1, 3))
+		self.assertEqual(converter.strToWideOffsets(2, 3), (3, 4))
+		self.assertEqual(converter.strToWideOffsets(3, 4), (4, 6))
+		self.assertEqual(converter.strToWideOffsets(4, 5), (6, 8))
+		self.assertEqual(converter.strToWideOffsets(2, 5), (3, 8))
+		self.assertEqual(converter.strToWideOffsets(5), 8)
+		self.assertEqual(converter.wideToStrOffsets(0, 8), (0, 5))
+		self.assertEqual(converter.wideToStrOffsets(3, 4), (2, 3))
+		self.assertEqual(converter.wideToStrOffsets(4, 8), (3, 5))
+
+	def test_offsetsInsideSurrogatePair(self):
+		"""
+		A start offset inside a surrogate pair maps to the start of its character,
+		an end offset inside a surrogate pair maps to the end of its character.
+		"""
+		converter = WideStringOffsetConverter(text="a" + FACE_PALM + "b" + SMILE + THUMBS_UP)
+		self.assertEqual(converter.wideToStrOffsets(2, 2), (1, 1))
+		self.assertEqual(converter.wideToStrOffsets(2, 3), (1, 2))
+		self.assertEqual(converter.wideToStrOffsets(1, 3), (1, 2))
+		self.assertEqual(converter.wideToStrOffsets(0, 2), (0, 2))
+		self.assertEqual(converter.wideToStrOffsets(5, 5), (3, 3))
+		self.assertEqual(converter.wideToStrOffsets(5, 7), (3, 5))
+		self.assertEqual(converter.wideToStrOffsets(7, 8), (4, 5))
+
+	def test_loneSurrogates(self):
+		"""Strings containing surrogate characters are converted by encoding and decoding them."""
+		converter = WideStringOffsetConverter(text="a\ud83eb")
+		self.assertIsNone(converter._astralStrOffsets)
+		self.assertIsNone(converter._astralWideOffsets)
+		self.assertEqual(converter.wideStringLength, 3)
+		self.assertEqual(converter.strToWideOffsets(1, 2), (1, 2))
+		self.assertEqual(converter.wideToStrOffsets(1, 2), (1, 2))
+		self.assertEqual(converter.wideToStrOffsets(2, 2), (2, 2))
+		converter = WideStringOffsetConverter(text="\udd26a" + FACE_PALM)
+		self.assertIsNone(converter._astralStrOffsets)
+		self.assertEqual(converter.wideStringLength, 4)
+		self.assertEqual(converter.strToWideOffsets(0, 3), (0, 4))
+		self.assertEqual(converter.wideToStrOffsets(0, 1), (0, 1))
+		self.assertEqual(converter.wideToStrOffsets(3, 3), (2, 2))
+		self.assertEqual(converter.wideToStrOffsets(3, 4), (2, 3))
+
+
+class TestAstralCharacterOffsetsParity(unittest.TestCase):
+	"""
+	Tests that converting offsets with the astral character tables gives the same results
+	as converting them by encoding and decoding the string, including at surrogate pair boundaries,
+	for out of range offsets and for end offsets less than start offsets.
+	"""
+
+	TEXTS = (
+		"abc",
+		FACE_PALM,
+		FACE_PALM + SMILE + THUMBS_UP,
+		"a" + FACE_PALM + "b",
+		FACE_PALM + "ab" + SMILE,
+		"é" + THUMBS_UP + "中" + FACE_PALM,
+	)
+
+	@staticmethod
+	def _getConverters(text: str) -> tuple[WideStringOffsetConverter, WideStringOffsetConverter]:
+		converter = WideStringOffsetConverter(text=text)
+		referenceConverter = WideStringOffsetConverter(text=text)
+		# Force the encoding and decoding based conversion, as used for strings containing surrogates.
+		referenceConverter._astralStrOffsets = None
+		return converter, referenceConverter
+
+	@staticmethod
+	def _convert(convertFunc, *args, **kwargs) -> int | tuple[int, int] | type[Exception]:
+		try:
+			return convertFunc(*args, **kwargs)
+		except (IndexError, ValueError) as e:
+			return type(e)
+
+	def test_strToWideOffsets(self):
+		for text in self.TEXTS:
+			converter, referenceConverter = self._getConverters(text)
+			self.assertIsNotNone(converter._astralStrOffsets)
+			self.assertEqual(converter.wideStringLength, referenceConverter.wideStringLength)
+			for start in range(-1, converter.strLength + 2):
+				for end in (None, *range(start - 1, converter.strLength + 2)):
+					for raiseOnError in (False, True):
+						with self.subTest(text=text, start=start, end=end, raiseOnError=raiseOnError):
+							self.assertEqual(
+								self._convert(converter.strToWideOffsets, start, end, raiseOnError),
+								self._convert(referenceConverter.strToWideOffsets, start, end, raiseOnError),
+							)
+
+	def test_wideToStrOffsets(self):
+		for text in self.TEXTS:
+			converter, referenceConverter = self._getConverters(text)
+			self.assertIsNotNone(converter._astralWideOffsets)
+			for start in range(-1, converter.wideStringLength + 2):
+				for end in range(start - 1, converter.wideStringLength + 2):
+					for raiseOnError in (False, True):
+						with self.subTest(text=text, start=start, end=end, raiseOnError=raiseOnError):
+							self.assertEqual(
+								self._convert(converter.wideToStrOffsets, start, end, raiseOnError),
+								self._convert(referenceConverter.wideToStrOffsets, start, end, raiseOnError),
+							)
+
+	def test_raiseOnError(self):
+		converter = WideStringOffsetConverter(text="a" + FACE_PALM)
+		self.assertEqual(converter.strToWideOffsets(0, 3, raiseOnError=False), (0, 3))
+		self.assertEqual(converter.wideToStrOffsets(1, 4, raiseOnError=False), (1, 2))
+		self.assertRaises(IndexError, converter.strToWideOffsets, 0, 3, raiseOnError=True)
+		self.assertRaises(IndexError, converter.strToWideOffsets, -1, 1, raiseOnError=True)
+		self.assertRaises(IndexError, converter.wideToStrOffsets, 0, 4, raiseOnError=True)
+		self.assertRaises(IndexError, converter.wideToStrOffsets, -1, 2, raiseOnError=True)
+		self.assertRaises(ValueError, converter.strToWideOffsets, 2, 1)
+		self.assertRaises(ValueError, converter.wideToStrOffsets, 2, 1)
+
+
 class TestEdgeCases(unittest.TestCase):
 	"""
 	Tests for edge cases, such as offsets out of range of a string,